@@ -55,6 +55,11 @@ class AppInitializer:
             'stats': self.stats_service
         }
     
+    def shutdown(self):
+        """서버 종료 시 리소스 정리"""
+        self.rag_manager.close()
+        print("[AppInitializer] 리소스 정리 완료")
+    
     def print_startup_info(self):
         """서버 시작 정보 출력"""
         print("\n" + "=" * 60)
@@ -62,7 +67,7 @@ class AppInitializer:
         print("=" * 60)
         print(f"포트: {Config.SERVER_PORT}")
         print(f"LLM 모델: {Config.LLM_MODEL}")
-        print(f"임베딩 모델: {Config.EMBEDDING_MODEL}")
+        print(f"임베딩 모델: {Config.get_active_embedding_model()}")
         print(f"문서 수: {self.document_service.get_document_count()}")
         print(f"아키텍처: 모듈화 + 서비스 레이어")
         print("=" * 60)
@@ -1,4 +1,6 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
 url = "http://localhost:8002/generate"
 payload = {
@@ -7,7 +9,24 @@ payload = {
     "use_rag": False,
     "use_memory": False
 }
+repeat = 1  # 반복 요청 횟수 (부하 테스트 시 늘려서 사용)
 
-response = requests.post(url, json=payload)
-print(response.status_code)
-print(response.json())
+# 연결 재사용 (Keep-Alive) + 429 응답 시 지수 백오프 재시도
+# /generate는 멱등하지 않으므로 (use_memory=True면 save_context가 중복 실행될 수 있음)
+# 서버가 작업 전에 거절한 429와 연결 실패만 재시도하고 5xx/읽기 오류는 재시도하지 않음
+retry = Retry(
+    total=3,
+    read=0,  # 요청 전송 후 끊긴 경우 재전송하지 않음
+    other=0,
+    backoff_factor=0.5,
+    status_forcelist=(429,),
+    allowed_methods=frozenset({"POST"}),
+    raise_on_status=False  # 재시도 소진 시 마지막 응답을 그대로 반환
+)
+session = requests.Session()
+session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=10, max_retries=retry))
+
+for _ in range(repeat):
+    response = session.post(url, json=payload)
+    print(response.status_code)
+    print(response.json())
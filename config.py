@@ -33,6 +33,10 @@ class Config:
     # 모델 설정
     LLM_MODEL = None
     EMBEDDING_MODEL = None
+    EMBEDDING_BACKEND = None  # "openai" 또는 "local"
+    LOCAL_EMBEDDING_MODEL = None
+    LOCAL_QUERY_PREFIX = None  # 로컬 모델 검색 쿼리 접두어 (e5 계열: "query: ")
+    LOCAL_PASSAGE_PREFIX = None  # 로컬 모델 문서 접두어 (e5 계열: "passage: ")
     
     # LLM 파라미터
     TEMPERATURE = None
@@ -83,6 +87,10 @@ class Config:
             model = cls._config_data.get('model', {})
             cls.LLM_MODEL = model.get('llm_model', 'gpt-3.5-turbo')
             cls.EMBEDDING_MODEL = model.get('embedding_model', 'text-embedding-3-small')
+            cls.EMBEDDING_BACKEND = model.get('embedding_backend', 'openai')
+            cls.LOCAL_EMBEDDING_MODEL = model.get('local_embedding_model', 'intfloat/multilingual-e5-small')
+            cls.LOCAL_QUERY_PREFIX = model.get('local_query_prefix', 'query: ')
+            cls.LOCAL_PASSAGE_PREFIX = model.get('local_passage_prefix', 'passage: ')
             
             # LLM 파라미터
             params = cls._config_data.get('llm_parameters', {})
@@ -144,6 +152,18 @@ class Config:
             raise ValueError("LLM_MODEL이 설정되지 않았습니다!")
         if not cls.EMBEDDING_MODEL:
             raise ValueError("EMBEDDING_MODEL이 설정되지 않았습니다!")
+        if cls.EMBEDDING_BACKEND not in ("openai", "local"):
+            raise ValueError(
+                f"지원하지 않는 EMBEDDING_BACKEND입니다: {cls.EMBEDDING_BACKEND}\n"
+                "'openai' 또는 'local'을 사용해주세요."
+            )
+    
+    @classmethod
+    def get_active_embedding_model(cls) -> str:
+        """실제로 사용 중인 임베딩 모델 이름 반환 (백엔드에 따라 결정)"""
+        if cls.EMBEDDING_BACKEND == "local":
+            return cls.LOCAL_EMBEDDING_MODEL
+        return cls.EMBEDDING_MODEL
     
     @classmethod
     def create_directories(cls):
@@ -178,7 +198,12 @@ class Config:
             },
             "model": {
                 "llm_model": cls.LLM_MODEL,
-                "embedding_model": cls.EMBEDDING_MODEL
+                "embedding_model": cls.EMBEDDING_MODEL,
+                "embedding_backend": cls.EMBEDDING_BACKEND,
+                "local_embedding_model": cls.LOCAL_EMBEDDING_MODEL,
+                "local_query_prefix": cls.LOCAL_QUERY_PREFIX,
+                "local_passage_prefix": cls.LOCAL_PASSAGE_PREFIX,
+                "active_embedding_model": cls.get_active_embedding_model()
             },
             "llm_parameters": {
                 "temperature": cls.TEMPERATURE,
@@ -202,7 +227,8 @@ class Config:
         print("=" * 60)
         print(f"서버: {cls.SERVER_HOST}:{cls.SERVER_PORT}")
         print(f"LLM 모델: {cls.LLM_MODEL}")
-        print(f"임베딩 모델: {cls.EMBEDDING_MODEL}")
+        print(f"임베딩 모델: {cls.get_active_embedding_model()}")
+        print(f"임베딩 백엔드: {cls.EMBEDDING_BACKEND}")
         print(f"Temperature: {cls.TEMPERATURE}")
         print(f"Max Tokens: {cls.MAX_TOKENS}")
         print(f"메모리 K: {cls.MEMORY_K}")
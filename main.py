@@ -3,6 +3,8 @@ main.py - RAG 기반 LLM 서버 (API 엔드포인트)
 외부 서버와 통신하는 API 엔드포인트만 정의합니다.
 비즈니스 로직은 services.py에 구현되어 있습니다.
 """
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, UploadFile, File, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -37,10 +39,18 @@ stats_service = services['stats']
 # [FastAPI 앱 생성]
 # ============================================
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """서버 수명 주기 - 종료 시 리소스 정리"""
+    yield
+    initializer.shutdown()
+
+
 app = FastAPI(
     title=Config.SERVER_TITLE,
     description=Config.SERVER_DESCRIPTION,
-    version=Config.SERVER_VERSION
+    version=Config.SERVER_VERSION,
+    lifespan=lifespan
 )
 
 # CORS 설정
@@ -68,7 +78,7 @@ async def generate_response(request: GenerateRequest):
     Returns:
         GenerateResponse: AI 응답
     """
-    return chat_service.generate_response(request)
+    return await chat_service.generate_response(request)
 
 
 # ============================================
@@ -91,8 +101,12 @@ async def add_document(request: AddDocumentRequest):
     if result["success"]:
         return {
             "success": True,
-            "message": f"{result['chunks_created']}개의 청크로 분할되어 추가되었습니다",
-            "chunks_created": result['chunks_created']
+            "message": (
+                f"{result['chunks_created']}개의 청크로 분할되어 추가되었습니다 "
+                f"(중복 {result['chunks_skipped']}개 건너뜀)"
+            ),
+            "chunks_created": result['chunks_created'],
+            "chunks_skipped": result['chunks_skipped']
         }
     else:
         raise HTTPException(status_code=500, detail=result.get("error"))
@@ -130,7 +144,7 @@ async def search_documents(query: str, k: int = 3):
     Returns:
         Dict: 검색 결과
     """
-    result = document_service.search_documents(query, k)
+    result = await document_service.search_documents(query, k)
     
     if result["success"]:
         return result
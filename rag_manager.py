@@ -6,13 +6,19 @@ from langchain_openai import OpenAIEmbeddings
 from langchain_chroma import Chroma
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.messages import SystemMessage
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnablePassthrough
+import httpx
 
 from typing import List
 from datetime import datetime
+import asyncio
+import hashlib
+import importlib.util
 import os
+import time
 
 from config import Config
 from prompts import PromptManager
@@ -21,6 +27,12 @@ from prompts import PromptManager
 class RAGManager:
     """RAG 관리 클래스 - 메모리 통합"""
 
+    # 한 번에 임베딩/저장할 청크 수 (OpenAI 입력 한도 2048 이하)
+    BULK_BATCH_SIZE = 512
+
+    # 문서 수 캐시 유효 시간 (초)
+    DOC_COUNT_TTL = 5.0
+
     def __init__(self, config: Config = None, prompt_manager: PromptManager = None, llm = None):
         """
         Args:
@@ -30,24 +42,112 @@ class RAGManager:
         """
         self.config = config or Config()
         self.prompt_manager = prompt_manager or PromptManager()
+
+        # 체인/리트리버는 첫 요청 시 생성해서 캐시 (llm 설정 시 초기화)
         self.llm = llm
 
-        print(f"[RAGManager] 임베딩 모델 로딩: {self.config.EMBEDDING_MODEL}")
+        # 텍스트 분할기는 한 번만 생성해서 재사용 (tiktoken 없이 작동하는 간단한 분할)
+        self._splitter = RecursiveCharacterTextSplitter(
+            chunk_size=self.config.CHUNK_SIZE,
+            chunk_overlap=self.config.CHUNK_OVERLAP,
+            length_function=len,
+            is_separator_regex=False,  # tiktoken 사용 안 함
+            separators=["\n\n", "\n", ". ", " ", ""]
+        )
+
+        print(f"[RAGManager] 임베딩 모델 로딩: {self.config.get_active_embedding_model()} ({self.config.EMBEDDING_BACKEND})")
+
+        # OpenAI 임베딩용 공유 HTTP 클라이언트 (OpenAI 백엔드에서만 생성, close()로 정리)
+        self._http_client = None
 
         self.embeddings = self._initialize_embeddings()
         self.vectorstore = self._initialize_vectorstore()
 
         print(f"[RAGManager] RAG 초기화 완료")
 
-    def _initialize_embeddings(self) -> OpenAIEmbeddings:
+    @property
+    def llm(self):
+        """LLM 모델"""
+        return self._llm
+
+    @llm.setter
+    def llm(self, llm):
+        # LLM이 바뀌면 캐시된 체인을 다시 생성
+        self._llm = llm
+        self._reset_chains()
+
+    def _reset_chains(self):
+        """캐시된 리트리버/체인 무효화"""
+        self._retriever = None
+        self._rag_chain = None
+        self._rag_chain_with_memory = None
+
+    def _get_retriever(self):
+        """캐시된 Retriever 반환"""
+        if self._retriever is None:
+            self._retriever = self.create_retriever()
+        return self._retriever
+
+    def _get_rag_chain(self):
+        """캐시된 RAG 체인 반환"""
+        if self._rag_chain is None:
+            self._rag_chain = self.create_rag_chain()
+        return self._rag_chain
+
+    def _get_rag_chain_with_memory(self):
+        """캐시된 RAG + 메모리 체인 반환"""
+        if self._rag_chain_with_memory is None:
+            self._rag_chain_with_memory = self.create_rag_chain_with_memory()
+        return self._rag_chain_with_memory
+
+    def _initialize_embeddings(self) -> Embeddings:
         """임베딩 모델 초기화"""
+        if self.config.EMBEDDING_BACKEND == "local":
+            # 로컬 sentence-transformers 모델 (네트워크 왕복/토큰 비용 없음)
+            from langchain_huggingface import HuggingFaceEmbeddings
+
+            embeddings = HuggingFaceEmbeddings(
+                model_name=self.config.LOCAL_EMBEDDING_MODEL,
+                model_kwargs={"device": "cpu"},
+                # e5 계열 모델은 문서/쿼리 접두어가 있어야 검색 품질이 유지됨
+                encode_kwargs={
+                    "batch_size": 64,
+                    "normalize_embeddings": True,
+                    "prompt": self.config.LOCAL_PASSAGE_PREFIX
+                },
+                query_encode_kwargs={
+                    "batch_size": 64,
+                    "normalize_embeddings": True,
+                    "prompt": self.config.LOCAL_QUERY_PREFIX
+                }
+            )
+            print(f"[RAGManager] 로컬 임베딩 모델 로딩 완료: {self.config.LOCAL_EMBEDDING_MODEL}")
+            return embeddings
+
+        # 임베딩 요청 간 연결(TLS) 재사용을 위한 공유 HTTP 클라이언트
+        # HTTP/2는 h2 패키지가 설치된 경우에만 사용
+        self._http_client = httpx.Client(
+            http2=importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            timeout=30
+        )
+
         embeddings = OpenAIEmbeddings(
             model=self.config.EMBEDDING_MODEL,
-            openai_api_key=self.config.OPENAI_API_KEY
+            openai_api_key=self.config.OPENAI_API_KEY,
+            http_client=self._http_client,
+            chunk_size=self.BULK_BATCH_SIZE  # 요청당 입력 수 (OpenAI 한도 2048 이하)
         )
         print(f"[RAGManager] 임베딩 모델 로딩 완료")
         return embeddings
 
+    def close(self):
+        """임베딩용 HTTP 클라이언트 연결 정리 (서버 종료 시 호출)"""
+        if self._http_client is not None:
+            self._http_client.close()
+            self._http_client = None
+            print(f"[RAGManager] HTTP 클라이언트 종료")
+
     def _initialize_vectorstore(self) -> Chroma:
         """벡터 스토어 초기화"""
         print(f"[RAGManager] ChromaDB 초기화")
@@ -62,6 +162,7 @@ class RAGManager:
                 collection_name="elderly_knowledge"
             )
             doc_count = vectorstore._collection.count()
+            self._set_document_count(doc_count)
             print(f"[RAGManager] ChromaDB 로드 완료 (문서 수: {doc_count})")
         except Exception as e:
             print(f"[RAGManager] 새 ChromaDB 생성")
@@ -70,6 +171,7 @@ class RAGManager:
                 embedding_function=self.embeddings,
                 collection_name="elderly_knowledge"
             )
+            self._set_document_count(0)
 
         return vectorstore
 
@@ -80,77 +182,58 @@ class RAGManager:
             search_kwargs={"k": self.config.RETRIEVER_K}
         )
 
+    @staticmethod
+    def format_docs(docs: List[Document]) -> str:
+        """검색된 문서를 컨텍스트 문자열로 변환"""
+        return "\n\n".join(doc.page_content for doc in docs)
+
+    def _create_system_message(self) -> SystemMessage:
+        """
+        시스템 프롬프트를 고정 메시지로 생성
+
+        템플릿으로 파싱하지 않으므로 요청마다 {context}, {question}만 포맷됩니다.
+        (프롬프트에 중괄호가 있어도 템플릿 변수로 해석되지 않음)
+        """
+        return SystemMessage(content=self.prompt_manager.get_prompt())
+
     def create_rag_chain(self):
         """
         RAG 체인 생성 (메모리 없음)
+
+        입력: {"context": 검색된 컨텍스트, "question": 질문}
+        검색은 체인 밖에서 한 번만 수행하고 결과를 컨텍스트로 전달합니다.
         """
         if not self.llm:
             raise ValueError("LLM이 설정되지 않았습니다!")
 
-        retriever = self.create_retriever()
-
         prompt = ChatPromptTemplate.from_messages([
-            ("system", self.prompt_manager.get_prompt()),
+            self._create_system_message(),
             ("system", "다음은 관련 정보입니다:\n{context}"),
             ("human", "{question}")
         ])
 
-        def format_docs(docs):
-            return "\n\n".join(doc.page_content for doc in docs)
-
-        rag_chain = (
-            {
-                "context": retriever | format_docs,
-                "question": RunnablePassthrough()
-            }
-            | prompt
-            | self.llm
-            | StrOutputParser()
-        )
+        rag_chain = prompt | self.llm | StrOutputParser()
 
         return rag_chain
 
     def create_rag_chain_with_memory(self):
         """
         ⭐ RAG + 메모리 통합 체인 생성
+
+        입력: {"context": 검색된 컨텍스트, "question": 질문, "chat_history": 대화 기록}
         """
         if not self.llm:
             raise ValueError("LLM이 설정되지 않았습니다!")
 
-        retriever = self.create_retriever()
-
         # ⭐ 대화 기록을 포함하는 프롬프트
         prompt = ChatPromptTemplate.from_messages([
-            ("system", self.prompt_manager.get_prompt()),
+            self._create_system_message(),
             ("system", "다음은 검색된 관련 정보입니다:\n{context}"),
             MessagesPlaceholder(variable_name="chat_history"),  # ← 대화 기록
             ("human", "{question}")
         ])
 
-        def format_docs(docs):
-            return "\n\n".join(doc.page_content for doc in docs)
-
-        # ⭐ 수정: RunnablePassthrough 대신 명시적 함수 사용
-        def get_question(x):
-            if isinstance(x, dict):
-                return x.get("question", "")
-            return x
-
-        def get_history(x):
-            if isinstance(x, dict):
-                return x.get("chat_history", [])
-            return []
-
-        rag_chain = (
-            {
-                "context": lambda x: format_docs(retriever.invoke(get_question(x))),
-                "question": get_question,
-                "chat_history": get_history
-            }
-            | prompt
-            | self.llm
-            | StrOutputParser()
-        )
+        rag_chain = prompt | self.llm | StrOutputParser()
 
         return rag_chain
 
@@ -164,14 +247,42 @@ class RAGManager:
         Returns:
             tuple: (응답, 출처 문서 리스트)
         """
-        rag_chain = self.create_rag_chain()
-        retriever = self.create_retriever()
+        rag_chain = self._get_rag_chain()
+        retriever = self._get_retriever()
+
+        # 문서 검색 (한 번만 수행해서 컨텍스트와 출처에 모두 사용)
+        source_docs = retriever.invoke(query)
 
         # 응답 생성
-        response = rag_chain.invoke(query)
+        response = rag_chain.invoke({
+            "context": self.format_docs(source_docs),
+            "question": query
+        })
 
-        # 출처 문서 검색
-        source_docs = retriever.invoke(query)
+        return response, source_docs
+
+    async def agenerate_with_rag(self, query: str) -> tuple[str, List[Document]]:
+        """
+        RAG를 사용한 응답 생성 - 비동기 버전 (메모리 없음)
+
+        검색과 LLM 호출의 네트워크 대기 동안 이벤트 루프가 다른 요청을 처리할 수 있습니다.
+
+        Args:
+            query: 사용자 질문
+
+        Returns:
+            tuple: (응답, 출처 문서 리스트)
+        """
+        rag_chain = self._get_rag_chain()
+
+        # 문서 검색 (스레드 풀에서 실행, 한 번만 수행해서 컨텍스트와 출처에 모두 사용)
+        source_docs = await self.asearch_documents(query)
+
+        # 응답 생성
+        response = await rag_chain.ainvoke({
+            "context": self.format_docs(source_docs),
+            "question": query
+        })
 
         return response, source_docs
 
@@ -192,20 +303,62 @@ class RAGManager:
         """
         print(f"[RAGManager] RAG + 메모리 모드: {len(chat_history)}개 대화 기록 사용")
 
-        rag_chain = self.create_rag_chain_with_memory()
-        retriever = self.create_retriever()
+        rag_chain = self._get_rag_chain_with_memory()
+        retriever = self._get_retriever()
+
+        # 문서 검색 (한 번만 수행)
+        source_docs = retriever.invoke(query)
 
         # 응답 생성 (대화 기록 포함)
         response = rag_chain.invoke({
+            "context": self.format_docs(source_docs),
             "question": query,
             "chat_history": chat_history
         })
 
-        # 출처 문서 검색
-        source_docs = retriever.invoke(query)
-
         return response, source_docs
 
+    @staticmethod
+    def _chunk_id(chunk: str) -> str:
+        """청크 내용 해시 (벡터 DB 문서 ID로 사용)"""
+        return hashlib.blake2b(chunk.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _filter_new_chunks(
+        self,
+        chunks: List[str],
+        metadatas: List[dict]
+    ) -> List[tuple[str, str, dict]]:
+        """
+        중복 청크 제거
+
+        같은 요청 안의 중복과 벡터 DB에 이미 저장된 청크를 모두 걸러냅니다.
+
+        Args:
+            chunks: 청크 리스트
+            metadatas: 청크별 메타데이터 리스트
+
+        Returns:
+            List[tuple]: 새로 저장할 (ID, 청크, 메타데이터) 리스트
+        """
+        unique = {}
+        for chunk, meta in zip(chunks, metadatas):
+            unique.setdefault(self._chunk_id(chunk), (chunk, meta))
+
+        ids = list(unique)
+        existing = set()
+        for start in range(0, len(ids), self.BULK_BATCH_SIZE):
+            result = self.vectorstore._collection.get(
+                ids=ids[start:start + self.BULK_BATCH_SIZE],
+                include=[]
+            )
+            existing.update(result["ids"])
+
+        return [
+            (chunk_id, *unique[chunk_id])
+            for chunk_id in ids
+            if chunk_id not in existing
+        ]
+
     def add_document(self, content: str, metadata: dict = None) -> dict:
         """
         문서 추가
@@ -218,35 +371,36 @@ class RAGManager:
             dict: 결과 정보
         """
         try:
-            # tiktoken 없이 작동하도록 간단한 분할 사용
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=self.config.CHUNK_SIZE,
-                chunk_overlap=self.config.CHUNK_OVERLAP,
-                length_function=len,
-                is_separator_regex=False,  # tiktoken 사용 안 함
-                separators=["\n\n", "\n", ". ", " ", ""]
-            )
+            chunks = self._splitter.split_text(content)
 
-            chunks = text_splitter.split_text(content)
+            # 메타데이터는 문서 단위로 한 번만 생성
+            metadata = metadata or {
+                "source": "manual",
+                "timestamp": str(datetime.now())
+            }
 
-            documents = [
-                Document(
-                    page_content=chunk,
-                    metadata=metadata or {
-                        "source": "manual",
-                        "timestamp": str(datetime.now())
-                    }
+            # 이미 저장된 청크는 다시 임베딩하지 않음
+            new_chunks = self._filter_new_chunks(chunks, [metadata] * len(chunks))
+
+            if new_chunks:
+                documents = [
+                    Document(page_content=chunk, metadata=meta)
+                    for _, chunk, meta in new_chunks
+                ]
+                self.vectorstore.add_documents(
+                    documents,
+                    ids=[chunk_id for chunk_id, _, _ in new_chunks]
                 )
-                for chunk in chunks
-            ]
 
-            self.vectorstore.add_documents(documents)
+            self._doc_count += len(new_chunks)
 
-            print(f"[RAGManager] 문서 추가 완료 ({len(chunks)}개 청크)")
+            skipped = len(chunks) - len(new_chunks)
+            print(f"[RAGManager] 문서 추가 완료 ({len(new_chunks)}개 청크, 중복 {skipped}개 건너뜀)")
 
             return {
                 "success": True,
-                "chunks_created": len(chunks)
+                "chunks_created": len(new_chunks),
+                "chunks_skipped": skipped
             }
 
         except Exception as e:
@@ -256,6 +410,67 @@ class RAGManager:
                 "error": str(e)
             }
 
+    def add_documents_bulk(self, items: List[tuple[str, dict]]) -> dict:
+        """
+        여러 문서를 한 번에 추가 (대량 적재용)
+
+        모든 청크를 먼저 모은 뒤 배치 단위로 임베딩하여
+        문서마다 임베딩 요청을 보내지 않도록 합니다.
+
+        Args:
+            items: (문서 내용, 메타데이터) 튜플 리스트
+
+        Returns:
+            dict: 결과 정보
+        """
+        try:
+            all_chunks: List[str] = []
+            all_metas: List[dict] = []
+            timestamp = str(datetime.now())
+
+            for content, metadata in items:
+                chunks = self._splitter.split_text(content)
+                meta = metadata or {"source": "manual", "timestamp": timestamp}
+                all_chunks.extend(chunks)
+                all_metas.extend(meta for _ in chunks)
+
+            # 이미 저장된 청크는 다시 임베딩하지 않음
+            new_chunks = self._filter_new_chunks(all_chunks, all_metas)
+
+            for start in range(0, len(new_chunks), self.BULK_BATCH_SIZE):
+                batch = new_chunks[start:start + self.BULK_BATCH_SIZE]
+                batch_chunks = [chunk for _, chunk, _ in batch]
+
+                vectors = self.embeddings.embed_documents(batch_chunks)
+                self.vectorstore._collection.add(
+                    ids=[chunk_id for chunk_id, _, _ in batch],
+                    embeddings=vectors,
+                    documents=batch_chunks,
+                    metadatas=[meta for _, _, meta in batch]
+                )
+
+            self._doc_count += len(new_chunks)
+
+            skipped = len(all_chunks) - len(new_chunks)
+            print(
+                f"[RAGManager] 대량 문서 추가 완료 "
+                f"({len(items)}개 문서, {len(new_chunks)}개 청크, 중복 {skipped}개 건너뜀)"
+            )
+
+            return {
+                "success": True,
+                "documents_added": len(items),
+                "chunks_created": len(new_chunks),
+                "chunks_skipped": skipped
+            }
+
+        except Exception as e:
+            print(f"[RAGManager] 대량 문서 추가 실패: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
     def search_documents(self, query: str, k: int = None) -> List[Document]:
         """
         문서 검색
@@ -271,19 +486,55 @@ class RAGManager:
         docs = self.vectorstore.similarity_search(query, k=k)
         return docs
 
+    def _set_document_count(self, count: int):
+        """문서 수 캐시 갱신"""
+        self._doc_count = count
+        self._doc_count_ts = time.time()
+
+    async def asearch_documents(self, query: str, k: int = None) -> List[Document]:
+        """
+        문서 검색 - 비동기 버전
+
+        Chroma 검색은 동기 작업이므로 스레드 풀에서 실행하여
+        검색 중에도 이벤트 루프가 막히지 않도록 합니다.
+
+        Args:
+            query: 검색 쿼리
+            k: 검색할 문서 수
+
+        Returns:
+            List[Document]: 검색된 문서 리스트
+        """
+        return await asyncio.to_thread(self.search_documents, query, k)
+
     def get_document_count(self) -> int:
-        """벡터 DB의 문서 수 조회"""
-        return self.vectorstore._collection.count()
+        """
+        벡터 DB의 문서 수 조회
+
+        문서 추가/초기화 시 캐시를 갱신하고,
+        DOC_COUNT_TTL이 지난 경우에만 Chroma에 다시 조회합니다.
+        """
+        if time.time() - self._doc_count_ts >= self.DOC_COUNT_TTL:
+            self._set_document_count(self.vectorstore._collection.count())
+        return self._doc_count
 
     def clear_documents(self) -> bool:
         """벡터 DB 초기화"""
         try:
-            import shutil
+            try:
+                # 컬렉션만 삭제 후 재생성 (클라이언트와 임베딩 연결은 유지)
+                self.vectorstore.reset_collection()
+            except Exception as e:
+                print(f"[RAGManager] 컬렉션 재생성 실패, DB 디렉토리 삭제: {e}")
+                import shutil
+
+                if os.path.exists(self.config.CHROMA_PERSIST_DIR):
+                    shutil.rmtree(self.config.CHROMA_PERSIST_DIR)
 
-            if os.path.exists(self.config.CHROMA_PERSIST_DIR):
-                shutil.rmtree(self.config.CHROMA_PERSIST_DIR)
+                self.vectorstore = self._initialize_vectorstore()
+                self._reset_chains()
 
-            self.vectorstore = self._initialize_vectorstore()
+            self._set_document_count(0)
 
             print(f"[RAGManager] 벡터 DB 초기화 완료")
             return True
@@ -2,6 +2,7 @@
 services.py - 비즈니스 로직 처리
 외부 API에서 호출되는 엔드포인트의 실제 로직을 처리합니다.
 """
+import asyncio
 from datetime import datetime
 from typing import List, Tuple, Dict, Optional
 
@@ -33,7 +34,7 @@ class ChatService:
         self.rag_manager = rag_manager
         self.memory_manager = memory_manager
     
-    def generate_response(self, request: GenerateRequest) -> GenerateResponse:
+    async def generate_response(self, request: GenerateRequest) -> GenerateResponse:
         """
         사용자 요청에 대한 응답 생성
         
@@ -52,10 +53,10 @@ class ChatService:
         try:
             if request.use_rag:
                 # RAG 모드
-                return self._generate_with_rag(request, start_time)
+                return await self._generate_with_rag(request, start_time)
             else:
                 # 일반 모드
-                return self._generate_without_rag(request, start_time)
+                return await self._generate_without_rag(request, start_time)
         
         except Exception as e:
             error_msg = str(e)
@@ -68,7 +69,7 @@ class ChatService:
                 error=error_msg
             )
     
-    def _generate_with_rag(
+    async def _generate_with_rag(
         self,
         request: GenerateRequest,
         start_time: datetime
@@ -77,7 +78,7 @@ class ChatService:
         print(f"[Service] RAG 모드 실행")
         
         # RAG로 응답 생성
-        bot_response, source_docs = self.rag_manager.generate_with_rag(request.text)
+        bot_response, source_docs = await self.rag_manager.agenerate_with_rag(request.text)
         
         # 출처 문서 정보 포맷팅
         source_info = [
@@ -103,12 +104,17 @@ class ChatService:
             source_documents=source_info if source_docs else None
         )
     
-    def _generate_without_rag(
+    async def _generate_without_rag(
         self,
         request: GenerateRequest,
         start_time: datetime
     ) -> GenerateResponse:
-        """RAG 없이 일반 응답 생성"""
+        """
+        RAG 없이 일반 응답 생성
+
+        LLM 호출은 동기 작업이므로 스레드 풀에서 실행하여 이벤트 루프를 막지 않습니다.
+        (메모리 조회/저장은 이벤트 루프에서 처리)
+        """
         print(f"[Service] 일반 모드 실행")
         
         if request.use_memory:
@@ -116,9 +122,10 @@ class ChatService:
             memory = self.memory_manager.get_or_create_memory(request.user_id)
             chat_history = memory.load_memory_variables({}).get("chat_history", [])
             
-            bot_response = self.llm_manager.generate_with_history(
+            bot_response = await asyncio.to_thread(
+                self.llm_manager.generate_with_history,
                 request.text,
-                chat_history
+                list(chat_history)  # 스레드 실행 중 다른 요청의 메모리 변경과 분리
             )
             
             self.memory_manager.save_context(
@@ -128,7 +135,10 @@ class ChatService:
             )
         else:
             # 단순 생성
-            bot_response = self.llm_manager.generate(request.text)
+            bot_response = await asyncio.to_thread(
+                self.llm_manager.generate,
+                request.text
+            )
         
         elapsed = (datetime.now() - start_time).total_seconds() * 1000
         print(f"[Service] 일반 응답 완료 ({elapsed:.0f}ms)")
@@ -167,7 +177,7 @@ class DocumentService:
         result = self.rag_manager.add_document(content, metadata)
         
         if result["success"]:
-            print(f"[Service] 문서 추가 완료: {result['chunks_created']}개 청크")
+            print(f"[Service] 문서 추가 완료: {result['chunks_created']}개 청크 (중복 {result['chunks_skipped']}개 건너뜀)")
         else:
             print(f"[Service] 문서 추가 실패: {result.get('error')}")
         
@@ -199,7 +209,11 @@ class DocumentService:
                     "success": True,
                     "filename": filename,
                     "chunks_created": result['chunks_created'],
-                    "message": "파일이 성공적으로 추가되었습니다"
+                    "chunks_skipped": result['chunks_skipped'],
+                    "message": (
+                        f"파일이 성공적으로 추가되었습니다 "
+                        f"({result['chunks_created']}개 청크 추가, 중복 {result['chunks_skipped']}개 건너뜀)"
+                    )
                 }
             else:
                 return {
@@ -215,7 +229,7 @@ class DocumentService:
                 "error": str(e)
             }
     
-    def search_documents(self, query: str, k: int = 3) -> Dict:
+    async def search_documents(self, query: str, k: int = 3) -> Dict:
         """
         문서 검색
         
@@ -229,7 +243,7 @@ class DocumentService:
         print(f"[Service] 문서 검색: {query}")
         
         try:
-            docs = self.rag_manager.search_documents(query, k)
+            docs = await self.rag_manager.asearch_documents(query, k)
             
             results = [
                 {
@@ -332,7 +346,7 @@ class StatsService:
             "total_conversations": self.memory_manager.get_total_conversations(),
             "documents_in_db": self.rag_manager.get_document_count(),
             "model": Config.LLM_MODEL,
-            "embedding_model": Config.EMBEDDING_MODEL
+            "embedding_model": Config.get_active_embedding_model()
         }
     
     def get_health(self) -> Dict: